@@ -1,21 +1,30 @@
 # Класс пули, управляет движением пули, проверкой попаданий во врагов и нанесением урона.
 
-import pygame
 from pygame.math import Vector2
 
+from entity import Entity
+from resources import load_image
 
-class Bullet(pygame.sprite.Sprite):
+
+class Bullet(Entity):
     """ Класс пули, управляет движением пули, проверкой попаданий во врагов и нанесением урона. """
-    def __init__(self, start_pos, target_pos, damage, game, image):
+    __slots__ = ('game', 'image', 'rect', 'position', 'target', 'target_enemy', 'damage', 'velocity')
+    # Скорость пули одинакова для всех пуль
+    speed = 5
+
+    def __init__(self, start_pos, target_pos, damage, game, image, target_enemy=None):
         super().__init__()
         self.game = game
-        self.image = pygame.image.load(image).convert_alpha()
+        self.image = load_image(image)
         self.rect = self.image.get_rect(center=start_pos)
         self.position = Vector2(start_pos)
         self.target = Vector2(target_pos)
-        self.speed = 5
         self.damage = damage
         self.velocity = self.calculate_velocity()
+        # Враг, по которому стреляли: пуля летит за ним, а её урон учитывается в game.level.ledger.
+        # Врага быстрее пули не догнать - по нему пуля летит в точку выстрела без учёта урона.
+        self.target_enemy = target_enemy if target_enemy is not None and target_enemy.speed < self.speed else None
+        self.game.level.ledger.record_shot(self)
 
         # Проиграть звук пули
         self.game.shoot_sound.play()
@@ -25,11 +34,28 @@ class Bullet(pygame.sprite.Sprite):
         velocity = direction * self.speed
         return velocity
 
+    def follow_target(self):
+        """ Направляет пулю на текущее положение цели. Если цель исчезла, снимает её урон и летит дальше прямо. """
+        enemy = self.target_enemy
+        if enemy is None:
+            return
+        if not enemy.alive():
+            self.game.level.ledger.release(enemy, self.damage)
+            self.target_enemy = None
+            return
+        self.target.update(enemy.position)
+        if self.position.distance_to(self.target) >= 1:
+            self.velocity = self.calculate_velocity()
+
     def update(self):
+        self.follow_target()
         self.position += self.velocity
         self.rect.center = self.position
-        if self.position.distance_to(self.target) < 10 or not self.game.is_position_inside(self.position):
+        # Пуля, летящая за врагом, исчезает только при попадании (или за краем поля)
+        reached = self.target_enemy is None and self.position.distance_to(self.target) < 10
+        if reached or not self.game.is_position_inside(self.position):
+            self.game.level.ledger.record_expired(self)
             self.kill()
 
     def is_position_inside(self, pos):
-        return 0 <= pos.x <= self.game.settings.screen_width and 0 <= pos.y <= self.game.settings.screen_height
+        return 0 <= pos.x <= self.game.settings.world_width and 0 <= pos.y <= self.game.settings.world_height
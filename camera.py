@@ -0,0 +1,45 @@
+# Камера для прокрутки большой карты: хранит смещение видимой области,
+# переводит координаты мира в экранные и обратно; rect - видимая область для отсечения объектов.
+
+import pygame
+
+
+class Camera:
+    """ Видимая область игрового мира. """
+    def __init__(self, settings):
+        """ Инициализирует камеру в левом верхнем углу карты. """
+        self.width = settings.screen_width
+        self.height = settings.screen_height
+        self.world_width = settings.world_width
+        self.world_height = settings.world_height
+        self.speed = settings.camera_speed
+        self.x = 0
+        self.y = 0
+
+    @property
+    def rect(self):
+        """ Видимая область в координатах мира. """
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def move(self, dx, dy):
+        """ Сдвигает камеру, не выходя за границы карты. """
+        self.x = max(0, min(self.x + dx, self.world_width - self.width))
+        self.y = max(0, min(self.y + dy, self.world_height - self.height))
+
+    def update(self, keys):
+        """
+        Прокрутка камеры клавишами со стрелками.
+        :param keys: Состояние клавиш из pygame.key.get_pressed()
+        """
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * self.speed
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * self.speed
+        if dx or dy:
+            self.move(dx, dy)
+
+    def apply(self, pos):
+        """ Переводит координаты мира в экранные. """
+        return pos[0] - self.x, pos[1] - self.y
+
+    def to_world(self, pos):
+        """ Переводит экранные координаты (например, курсора мыши) в координаты мира. """
+        return pos[0] + self.x, pos[1] + self.y
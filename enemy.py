@@ -1,29 +1,56 @@
 # Определяет класс врага, его движение по карте, здоровье и получение урона.
 
-import pygame
 from pygame.math import Vector2
-# from main import TowerDefenseGame
 
+from entity import Entity
+from resources import load_image
 
-class Enemy(pygame.sprite.Sprite):
+
+class EnemyType:
+    """ Общие для однотипных врагов данные: изображение, скорость, начальное здоровье и награда. """
+    __slots__ = ('image', 'speed', 'health', 'reward')
+
+    def __init__(self, image_path, speed=2, health=10, reward=50):
+        self.image = load_image(image_path)
+        self.speed = speed
+        self.health = health
+        self.reward = reward
+
+
+class Enemy(Entity):
     """ Определяет класс врага, его движение по карте, здоровье и получение урона. """
+    __slots__ = ('enemy_type', 'game', 'path', 'path_index', 'direction', 'health', 'position', 'rect')
 
-    def __init__(self, path, speed=2, health=10, image_path=None, game=None, reward=50):
+    def __init__(self, path, enemy_type, game):
         super().__init__()
-        self.image = pygame.Surface((30, 40))
-        self.image = pygame.image.load(image_path).convert_alpha()
-        self.rect = self.image.get_rect()
+        self.enemy_type = enemy_type
         self.game = game
         self.path = path
-        self.path_index = 0
-        self.speed = speed
-        self.health = health
-        self.reward = reward
+        self.health = enemy_type.health
         self.position = Vector2(path[0])
-        self.rect.center = self.position
+        self.rect = enemy_type.image.get_rect(center=self.position)
+        self.start_segment(0)
         # проиграть музыку появления врага
         self.game.enemy_hit_sound.play()
 
+    @property
+    def image(self):
+        return self.enemy_type.image
+
+    @property
+    def speed(self):
+        return self.enemy_type.speed
+
+    @property
+    def reward(self):
+        return self.enemy_type.reward
+
+    def start_segment(self, index):
+        """ Переходит на участок пути с номером index и запоминает направление движения по нему. """
+        self.path_index = index
+        if index < len(self.path) - 1:
+            self.direction = (Vector2(self.path[index + 1]) - self.path[index]).normalize()
+
     def take_damage(self, amount):
         # проиграть музыку повреждения врага
         self.game.enemy_hit_sound.play()
@@ -32,21 +59,17 @@ class Enemy(pygame.sprite.Sprite):
         if self.health <= 0:
             # Получить награду за уничтожение врага
             self.game.settings.starting_money += self.reward
-            self.game.last_event_text = f'The enemy has been destroyed + ${int(self.reward)}'
-            print(self.game.last_event_text)
+            self.game.log_event(f'The enemy has been destroyed + ${int(self.reward)}')
             self.kill()
 
     def update(self):
         if self.path_index < len(self.path) - 1:
-            start_point = Vector2(self.path[self.path_index])
-            end_point = Vector2(self.path[self.path_index + 1])
-            direction = (end_point - start_point).normalize()
-
-            self.position += direction * self.speed
+            speed = self.enemy_type.speed
+            self.position += self.direction * speed
             self.rect.center = self.position
 
-            if self.position.distance_to(end_point) < self.speed:
-                self.path_index += 1
+            if self.position.distance_to(self.path[self.path_index + 1]) < speed:
+                self.start_segment(self.path_index + 1)
 
             if self.path_index >= len(self.path) - 1:
                 self.game.game_over()
@@ -0,0 +1,68 @@
+# Лёгкие игровые объекты без __dict__ и контейнер для них.
+# Контейнер заменяет pygame.sprite.Group: хранит объекты и умеет их отрисовывать.
+
+
+class Entity:
+    """ Базовый класс игровых объектов. Объект принадлежит не более чем одной группе. """
+    __slots__ = ('group',)
+
+    def __init__(self):
+        self.group = None
+
+    def alive(self):
+        """ Объект находится в группе. """
+        return self.group is not None
+
+    def kill(self):
+        """ Удаляет объект из группы. """
+        if self.group is not None:
+            self.group.remove(self)
+
+
+class EntityGroup:
+    """ Упорядоченный набор объектов с методами update() и draw(), как у pygame.sprite.Group. """
+    def __init__(self):
+        # Словарь используется как упорядоченное множество
+        self.entities = {}
+
+    def add(self, entity):
+        """ Добавляет объект в группу. """
+        entity.group = self
+        self.entities[entity] = None
+
+    def remove(self, entity):
+        """ Удаляет объект из группы. """
+        if entity in self.entities:
+            del self.entities[entity]
+            entity.group = None
+
+    def empty(self):
+        """ Удаляет все объекты. """
+        for entity in self.entities:
+            entity.group = None
+        self.entities = {}
+
+    def __iter__(self):
+        # Копия позволяет удалять объекты во время перебора
+        return iter(list(self.entities))
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        return entity in self.entities
+
+    def update(self, *args):
+        """ Вызывает update() у всех объектов. """
+        for entity in list(self.entities):
+            entity.update(*args)
+
+    def draw(self, screen, camera):
+        """
+        Отрисовывает объекты по их image и rect, пропуская не попадающие в видимую область.
+        :param screen: Экран для отрисовки
+        :param camera: Камера (Camera), переводит координаты мира в экранные
+        """
+        view = camera.rect
+        screen.blits([(entity.image, camera.apply(entity.rect.topleft))
+                      for entity in self.entities if view.colliderect(entity.rect)], False)
@@ -0,0 +1,330 @@
+# Программный интерфейс игры для автоматических агентов: среда с reset/step
+# поверх игры без окна и векторная обёртка, шагающая несколькими средами сразу.
+
+import argparse
+import multiprocessing
+import time
+import traceback
+
+import numpy as np
+
+from settings import Settings, tower_classes
+from simulator import HeadlessGame
+
+# Действия агента: установка башни одного из типов или апгрейд башни в позиции
+action_kinds = ('basic', 'sniper', 'money', 'upgrade')
+# Коды типов башен в наблюдении, 0 - позиция свободна
+tower_type_ids = {tower_class: i + 1 for i, tower_class in enumerate(tower_classes.values())}
+
+
+class TowerDefenseEnv:
+    """
+    Среда для агентов. Действие - целое число: 0 - ничего не делать,
+    иначе encode_action(тип действия, индекс позиции из settings.tower_positions).
+    """
+    def __init__(self, preset='default', frame_skip=30, max_enemies=64, endless=False):
+        """
+        Инициализирует среду. Игра создаётся при вызове reset().
+        :param preset: Предустановка карты
+        :param frame_skip: Сколько кадров игры проходит за один шаг среды
+        :param max_enemies: Сколько врагов попадает в наблюдение
+        :param endless: Бесконечный режим
+        """
+        self.preset = preset
+        self.endless = endless
+        self.frame_skip = frame_skip
+        self.max_enemies = max_enemies
+        self.game = None
+        self.tower_positions = Settings(preset).tower_positions
+        self.slot_index = {pos: i for i, pos in enumerate(self.tower_positions)}
+        self.action_count = 1 + len(action_kinds) * len(self.tower_positions)
+
+    def encode_action(self, kind, slot):
+        """
+        Кодирует действие в целое число.
+        :param kind: Тип действия из action_kinds
+        :param slot: Индекс позиции в tower_positions
+        :return: Номер действия
+        """
+        return 1 + action_kinds.index(kind) * len(self.tower_positions) + slot
+
+    def decode_action(self, action):
+        """ Возвращает пару (тип действия, индекс позиции) или None для пустого действия. """
+        if not action:
+            return None
+        kind, slot = divmod(int(action) - 1, len(self.tower_positions))
+        return action_kinds[kind], slot
+
+    def reset(self, seed=None):
+        """
+        Начинает новую игру. Игра создаётся один раз, затем перезапускается без загрузки ресурсов.
+        :param seed: Начальное значение генератора случайных чисел игры
+        :return: Наблюдение
+        """
+        if self.game is None:
+            self.game = HeadlessGame(self.preset, seed, endless=self.endless)
+        else:
+            self.game.restart(seed)
+        return self.observe()
+
+    def apply_action(self, action):
+        """
+        Выполняет действие агента.
+        :return: True, если действие выполнено
+        """
+        decoded = self.decode_action(action)
+        if decoded is None:
+            return True
+        kind, slot = decoded
+        level = self.game.level
+        pos = self.tower_positions[slot]
+        tower = level.tower_at(pos)
+        if kind == 'upgrade':
+            if tower is None:
+                return False
+            tower_level = tower.level
+            tower.upgrade()
+            return tower.level > tower_level
+        if tower is not None:
+            return False
+        towers_count = len(level.towers)
+        level.attempt_place_tower(pos, kind)
+        return len(level.towers) > towers_count
+
+    def is_done(self):
+        """ Игра закончена победой или поражением. """
+        return self.game.is_game_over or self.game.level.all_waves_complete
+
+    def step(self, action):
+        """
+        Выполняет действие и проигрывает frame_skip кадров без отрисовки.
+        :param action: Номер действия
+        :return: Наблюдение, награда (заработанные за шаг деньги), признак окончания игры, словарь с информацией
+        """
+        valid = self.apply_action(action)
+        money = self.game.settings.starting_money
+        for _ in range(self.frame_skip):
+            self.game.step(render=False)
+            if self.is_done():
+                break
+        reward = self.game.settings.starting_money - money
+        info = {
+            'valid_action': valid,
+            'wave': self.game.level.current_wave,
+            'won': self.game.level.all_waves_complete,
+        }
+        return self.observe(), reward, self.is_done(), info
+
+    def observe(self):
+        """
+        Наблюдение в виде массивов NumPy:
+        enemies - (max_enemies, 4): x, y, здоровье, номер участка пути;
+        towers - (число позиций, 2): код типа башни и её уровень;
+        money, lives, wave - скаляры.
+        """
+        level = self.game.level
+        enemies = np.zeros((self.max_enemies, 4), dtype=np.float32)
+        for i, enemy in zip(range(self.max_enemies), level.enemies):
+            enemies[i] = enemy.position.x, enemy.position.y, enemy.health, enemy.path_index
+        towers = np.zeros((len(self.tower_positions), 2), dtype=np.int16)
+        for tower in level.towers:
+            slot = self.slot_index.get((int(tower.position.x), int(tower.position.y)))
+            if slot is not None:
+                towers[slot] = tower_type_ids[type(tower)], tower.level
+        return {
+            'enemies': enemies,
+            'enemy_count': np.int32(len(level.enemies)),
+            'towers': towers,
+            'money': np.float32(self.game.settings.starting_money),
+            # Игра заканчивается, как только враг доходит до конца пути
+            'lives': np.int32(0 if self.game.is_game_over else self.game.settings.lives),
+            'wave': np.int32(level.current_wave),
+        }
+
+
+def stack_observations(observations):
+    """ Объединяет наблюдения нескольких сред в массивы с первой размерностью по средам. """
+    return {key: np.stack([obs[key] for obs in observations]) for key in observations[0]}
+
+
+class VectorEnv:
+    """
+    Несколько сред в одном процессе, шагающих синхронно.
+    Закончившаяся среда сразу начинает новую игру, последнее наблюдение кладётся в info['final_observation'].
+    """
+    def __init__(self, num_envs, preset='default', **env_kwargs):
+        """ Создаёт num_envs сред с одинаковыми параметрами. """
+        if num_envs < 1:
+            raise ValueError(f'num_envs must be at least 1, got {num_envs}')
+        self.envs = [TowerDefenseEnv(preset, **env_kwargs) for _ in range(num_envs)]
+        self.num_envs = num_envs
+        self.action_count = self.envs[0].action_count
+        self.seeds = [None] * num_envs
+
+    def reset(self, seed=None):
+        """
+        Начинает новые игры во всех средах.
+        :param seed: Начальное значение, среда i получает seed + i
+        :return: Объединённое наблюдение
+        """
+        self.seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        return stack_observations([env.reset(s) for env, s in zip(self.envs, self.seeds)])
+
+    def _reset_env(self, i):
+        """ Перезапускает среду i со следующим по порядку seed. """
+        if self.seeds[i] is not None:
+            self.seeds[i] += self.num_envs
+        return self.envs[i].reset(self.seeds[i])
+
+    def step(self, actions):
+        """
+        Выполняет по одному действию в каждой среде.
+        :param actions: Последовательность номеров действий длиной num_envs
+        :return: Наблюдения, массив наград, массив признаков окончания, список словарей с информацией
+        """
+        observations, rewards, dones, infos = [], [], [], []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, reward, done, info = env.step(action)
+            if done:
+                info['final_observation'] = obs
+                obs = self._reset_env(i)
+            observations.append(obs)
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return (stack_observations(observations), np.array(rewards, dtype=np.float32),
+                np.array(dones, dtype=bool), infos)
+
+    def close(self):
+        """ Освобождает среды. """
+        self.envs = []
+
+
+def _worker(connection, num_envs, preset, env_kwargs):
+    """
+    Процесс-исполнитель: держит VectorEnv и выполняет команды из канала.
+    На каждую команду отвечает парой (True, результат) или (False, текст ошибки).
+    """
+    vector_env = None
+    error = None
+    try:
+        vector_env = VectorEnv(num_envs, preset, **env_kwargs)
+    except Exception:
+        error = traceback.format_exc()
+    while True:
+        command, data = connection.recv()
+        if command == 'close':
+            connection.close()
+            break
+        if vector_env is None:
+            connection.send((False, error))
+            continue
+        try:
+            if command == 'reset':
+                connection.send((True, vector_env.reset(data)))
+            elif command == 'step':
+                connection.send((True, vector_env.step(data)))
+            else:
+                connection.send((False, f'unknown command {command!r}'))
+        except Exception:
+            connection.send((False, traceback.format_exc()))
+
+
+def _receive_all(connections):
+    """
+    Получает ответы всех процессов-исполнителей. Ошибку исполнителя пробрасывает как RuntimeError,
+    но только после чтения всех ответов, чтобы в каналах не осталось устаревших результатов.
+    """
+    replies = [connection.recv() for connection in connections]
+    for ok, result in replies:
+        if not ok:
+            raise RuntimeError(f'Env worker failed:\n{result}')
+    return [result for _, result in replies]
+
+
+class ProcessVectorEnv:
+    """ Среды, распределённые по процессам-исполнителям. Каждый процесс шагает своей частью сред синхронно. """
+    def __init__(self, num_envs, workers=2, preset='default', **env_kwargs):
+        """ Запускает процессы и распределяет между ними num_envs сред. Процессов не больше, чем сред. """
+        if num_envs < 1:
+            raise ValueError(f'num_envs must be at least 1, got {num_envs}')
+        if workers < 1:
+            raise ValueError(f'workers must be at least 1, got {workers}')
+        workers = min(workers, num_envs)
+        context = multiprocessing.get_context('spawn')
+        self.num_envs = num_envs
+        self.action_count = TowerDefenseEnv(preset, **env_kwargs).action_count
+        self.counts = [num_envs // workers + (i < num_envs % workers) for i in range(workers)]
+        self.connections = []
+        self.processes = []
+        for count in self.counts:
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, args=(child, count, preset, env_kwargs), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def reset(self, seed=None):
+        """ Начинает новые игры во всех средах, среда i получает seed + i. """
+        offset = 0
+        for connection, count in zip(self.connections, self.counts):
+            connection.send(('reset', None if seed is None else seed + offset))
+            offset += count
+        return stack_observations(_receive_all(self.connections))
+
+    def step(self, actions):
+        """ Выполняет по одному действию в каждой среде, аналогично VectorEnv.step(). """
+        offset = 0
+        for connection, count in zip(self.connections, self.counts):
+            connection.send(('step', list(actions[offset:offset + count])))
+            offset += count
+        results = _receive_all(self.connections)
+        observations = stack_observations([result[0] for result in results])
+        rewards = np.concatenate([result[1] for result in results])
+        dones = np.concatenate([result[2] for result in results])
+        infos = [info for result in results for info in result[3]]
+        return observations, rewards, dones, infos
+
+    def close(self):
+        """ Останавливает процессы-исполнители. """
+        for connection in self.connections:
+            connection.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+
+def benchmark(num_envs=8, steps=200, workers=0, preset='default', seed=0):
+    """
+    Замер скорости: случайный агент шагает всеми средами.
+    :param workers: Количество процессов, 0 - все среды в текущем процессе
+    :return: Количество шагов сред в секунду
+    """
+    if workers:
+        vector_env = ProcessVectorEnv(num_envs, workers, preset)
+    else:
+        vector_env = VectorEnv(num_envs, preset)
+    rng = np.random.default_rng(seed)
+    vector_env.reset(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        # В основном агент ничего не делает, иногда пытается поставить или улучшить башню
+        actions = rng.integers(0, vector_env.action_count, num_envs) * (rng.random(num_envs) < 0.2)
+        vector_env.step(actions)
+    elapsed = time.perf_counter() - start
+    vector_env.close()
+    return num_envs * steps / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Замер скорости векторной среды')
+    parser.add_argument('--envs', type=int, default=8)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=0)
+    parser.add_argument('--preset', default='default')
+    args = parser.parse_args()
+    steps_per_second = benchmark(args.envs, args.steps, args.workers, args.preset)
+    print(f'{args.envs} envs, {args.workers or "no"} workers: {steps_per_second:.1f} env steps/s '
+          f'({steps_per_second * 30:.0f} game frames/s)')
@@ -12,6 +12,8 @@ class Grid:
         self.settings = game.settings
         self.screen = game.screen
         self.available_spots = self.settings.tower_positions
+        # Множество для быстрой проверки позиции на большой карте
+        self._spots_set = set(self.available_spots)
         self.towers = []
 
     def update(self):
@@ -19,14 +21,27 @@ class Grid:
         pass
 
     def draw(self):
-        """ Отображает сетку на экране. """
-        for spot in self.available_spots:
-            pygame.draw.circle(self.screen, (0, 255, 0), spot, 15, 2)
+        """ Отображает видимую часть сетки на экране. """
+        camera = self.game.camera
+        for spot in self.visible_spots():
+            pygame.draw.circle(self.screen, (0, 255, 0), camera.apply(spot), 15, 2)
+
+    def visible_spots(self):
+        """ Возвращает позиции для башен, попадающие в видимую область камеры. """
+        cell_width, cell_height = self.settings.grid_size
+        view = self.game.camera.rect
+        spots = []
+        for x in range(view.left // cell_width, view.right // cell_width + 1):
+            for y in range(view.top // cell_height, view.bottom // cell_height + 1):
+                spot = (x * cell_width + cell_width // 2, y * cell_height + cell_height // 2)
+                if spot in self._spots_set:
+                    spots.append(spot)
+        return spots
 
     def place_tower(self, tower=None):
         """ Размещает башню на сетке. """
         grid_pos = self.get_grid_position(tower.position)
-        if grid_pos in self.available_spots and not any(tower.rect.collidepoint(grid_pos) for tower in self.towers):
+        if grid_pos in self._spots_set and not any(tower.rect.collidepoint(grid_pos) for tower in self.towers):
             self.towers.append(tower)
             return True
         return False
@@ -46,10 +61,11 @@ class Grid:
         Returns:
             tuple: центр нажатой клетки сетки.
         """
-        grid_x = mouse_pos[0] // 64 * 64 + 32
-        grid_y = mouse_pos[1] // 64 * 64 + 32
+        cell_width, cell_height = self.settings.grid_size
+        grid_x = mouse_pos[0] // cell_width * cell_width + cell_width // 2
+        grid_y = mouse_pos[1] // cell_height * cell_height + cell_height // 2
         return grid_x, grid_y
 
     def is_spot_available(self, grid_pos):
         """ Проверяет, доступно ли место для размещения башни. """
-        return grid_pos in self.available_spots and all(not tower.rect.collidepoint(grid_pos) for tower in self.towers)
+        return grid_pos in self._spots_set and all(not tower.rect.collidepoint(grid_pos) for tower in self.towers)
@@ -0,0 +1,72 @@
+# Учёт урона от пуль, которые уже летят к врагам. Башни не стреляют по врагу,
+# если летящих к нему пуль уже хватает, чтобы его уничтожить.
+
+
+class DamageLedger:
+    """ Ожидаемый урон по каждому врагу и счётчики выстрелов. """
+    def __init__(self, skip_covered=False):
+        """
+        Инициализирует пустой учёт.
+        :param skip_covered: Пропускать врагов, которых уже уничтожат летящие пули
+        """
+        self.skip_covered = skip_covered
+        # Враг -> суммарный урон летящих к нему пуль
+        self.pending = {}
+        # Выпущено пуль
+        self.shots_fired = 0
+        # Пуль, попавших во врага
+        self.hits = 0
+        # Урон сверх оставшегося здоровья врагов
+        self.overkill_damage = 0
+        # Пуль, улетевших мимо
+        self.wasted_bullets = 0
+
+    def reserve(self, enemy, damage):
+        """ Добавляет урон пули, летящей к врагу. """
+        self.pending[enemy] = self.pending.get(enemy, 0) + damage
+
+    def record_shot(self, bullet):
+        """ Учитывает выпущенную пулю. Урон резервируется, только если пуля летит за врагом и догонит его. """
+        self.shots_fired += 1
+        if bullet.target_enemy is not None:
+            self.reserve(bullet.target_enemy, bullet.damage)
+
+    def release(self, enemy, damage):
+        """ Снимает урон пули, которая больше не летит к врагу. """
+        left = self.pending.get(enemy, 0) - damage
+        if left > 0:
+            self.pending[enemy] = left
+        else:
+            self.pending.pop(enemy, None)
+
+    def is_covered(self, enemy):
+        """ Летящих к врагу пуль хватит, чтобы его уничтожить. """
+        return self.skip_covered and self.pending.get(enemy, 0) >= enemy.health
+
+    def record_hit(self, bullet, enemies):
+        """
+        Учитывает попадание пули. Вызывается до нанесения урона.
+        :param bullet: Попавшая пуля
+        :param enemies: Враги, в которых она попала
+        """
+        if bullet.target_enemy is not None:
+            self.release(bullet.target_enemy, bullet.damage)
+        self.hits += 1
+        for enemy in enemies:
+            if bullet.damage > enemy.health:
+                self.overkill_damage += bullet.damage - max(enemy.health, 0)
+
+    def record_expired(self, bullet):
+        """ Учитывает пулю, которая исчезла, ни в кого не попав. """
+        if bullet.target_enemy is not None:
+            self.release(bullet.target_enemy, bullet.damage)
+        self.wasted_bullets += 1
+
+    def stats(self):
+        """ Счётчики выстрелов в виде словаря. """
+        return {
+            'shots_fired': self.shots_fired,
+            'hits': self.hits,
+            'overkill_damage': round(self.overkill_damage),
+            'wasted_bullets': self.wasted_bullets,
+        }
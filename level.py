@@ -2,37 +2,84 @@
 # а также расстановку башен и обработку коллизий.
 
 import pygame
-from random import random, randint
-from enemy import Enemy
+from copy import deepcopy
+from enemy import Enemy, EnemyType
+from entity import EntityGroup
+from ledger import DamageLedger
 from settings import tower_classes, image_enemy_paths
+from spatial import SpatialHash
 
 
 class Level:
     """ Управляет уровнем игры, волнами врагов и расстановкой башен. """
 
     def __init__(self, game, waves_count=30):
-        """ Инициализирует уровень игры. """
+        """
+        Инициализирует уровень игры.
+        :param game: Игра
+        :param waves_count: Количество волн, None - бесконечный режим
+        """
         self.game = game
-        self.enemies = pygame.sprite.Group()
-        self.towers = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
-        self.waves = [
-            [{'path': self.game.settings.enemy_path, 'speed': 1, 'health': 100, 'reward': 10, 'image_path': image_enemy_paths[0][0]}] * 5,
-            [{'path': self.game.settings.enemy_path, 'speed': 1.5, 'health': 150, 'reward': 20, 'image_path': image_enemy_paths[1][0]}] * 7,
-            [{'path': self.game.settings.enemy_path, 'speed': 0.75, 'health': 200, 'reward': 30, 'image_path': image_enemy_paths[2][0]}] * 4,
-            [{'path': self.game.settings.enemy_path, 'speed': 0.5, 'health': 250, 'reward': 40, 'image_path': image_enemy_paths[3][0]}] * 7,
-            [{'path': self.game.settings.enemy_path, 'speed': 1.2, 'health': 300, 'reward': 50, 'image_path': image_enemy_paths[4][0]}] * 6,
-        ]
-        # Добавить еще waves_count - len(self.waves) волн
-        for i in range(len(self.waves), waves_count):
-            self.waves.append(self.random_level(i))
+        self.enemies = EntityGroup()
+        self.towers = EntityGroup()
+        self.bullets = EntityGroup()
+        # Индекс врагов для поиска целей и коллизий, перестраивается каждый кадр
+        self.enemy_index = SpatialHash()
+        # Ожидаемый урон летящих пуль и счётчики выстрелов: башни не стреляют по обречённым врагам
+        self.ledger = DamageLedger(skip_covered=True)
+        # Пути врагов: враги волны распределяются по всем путям поровну
+        self.paths = self.game.settings.enemy_paths
+        self.rng = self.game.settings.rng
+        # Собственная копия характеристик врагов: random_level усиливает их от волны к волне
+        self.enemy_properties = deepcopy([properties for _, properties in image_enemy_paths])
+        self.waves_count = waves_count
+        # Волны создаются по ходу игры, в памяти только текущая и следующая
+        self.wave_stream = self.generate_waves()
+        self.wave = next(self.wave_stream)
+        self.next_wave = next(self.wave_stream, None)
         self.current_wave = 0
         self.spawned_enemies = 0
         self.spawn_delay = 1000
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.last_spawn_time = self.game.get_ticks()
         self.all_waves_complete = False
         self.start_next_wave()
-        self.font = pygame.font.SysFont("Arial", 24)
+        self.font = self.game.font
+
+    def generate_waves(self):
+        """
+        Генератор волн: сначала пять фиксированных, затем случайные с растущей сложностью.
+        В бесконечном режиме волны не заканчиваются.
+        """
+        yield self.fixed_wave(0, 5, speed=1, health=100, reward=10)
+        yield self.fixed_wave(1, 7, speed=1.5, health=150, reward=20)
+        yield self.fixed_wave(2, 4, speed=0.75, health=200, reward=30)
+        yield self.fixed_wave(3, 7, speed=0.5, health=250, reward=40)
+        yield self.fixed_wave(4, 6, speed=1.2, health=300, reward=50)
+        level = 5
+        while self.waves_count is None or level < self.waves_count:
+            yield self.random_level(level) if self.waves_count is not None else self.endless_level(level)
+            level += 1
+
+    def random_deviation(self, number: float, deviation=0.2) -> float:
+        """
+        Вычисляет случайное число с отклонением
+        :param number: Исходное число
+        :param deviation: Максимально допустимое отклонение в большую или меньшую сторону (в долях)
+        :return: Число со случайным отклонением
+        """
+        return number + (self.rng.random()-0.5) * deviation * number * 2
+
+    def fixed_wave(self, enemy, count, **properties) -> list:
+        """
+        Волна из одинаковых врагов
+        :param enemy: Индекс изображения врага в image_enemy_paths
+        :param count: Количество врагов на каждом пути
+        :param properties: Характеристики врагов (speed, health, reward)
+        :return: Список врагов
+        """
+        enemy_type = EnemyType(image_enemy_paths[enemy][0], **properties)
+        return [{'path': self.paths[i % len(self.paths)], 'enemy_type': enemy_type}
+                for i in range(count * len(self.paths))]
 
     def random_level(self, level=1) -> list:
         """
@@ -40,49 +87,70 @@ class Level:
         :param level: Уровень сложности игры
         :return: Список врагов со случайными параметрами
         """
-        def random_deviation(number: float, deviation=0.2) -> float:
-            """
-            Вычисляет случайное число с отклонением
-            :param number: Исходное число
-            :param deviation: Максимально допустимое отклонение в большую или меньшую сторону (в долях)
-            :return: Число со случайным отклонением
-            """
-            return number + (random()-0.5) * deviation * number * 2
-
+        random_deviation = self.random_deviation
         wave = []
         for i in range(int(random_deviation(level * 2.5))):
             # Берем случайного врага
-            enemy = randint(0, len(image_enemy_paths)-1)
+            enemy = self.rng.randint(0, len(image_enemy_paths)-1)
 
             # Вносим изменения в характеристики врагов случайным образом
-            property_enemy_dict = image_enemy_paths[enemy][1]
+            property_enemy_dict = self.enemy_properties[enemy]
             for k, v in property_enemy_dict.items():
                 property_enemy_dict[k] = random_deviation(v) + v * level * 0.0015
 
-            # Добавляем врага к волне
-            wave.append({
-                'path': self.game.settings.enemy_path,
-                'image_path': image_enemy_paths[enemy][0],
-                **property_enemy_dict
-            })
+            # Добавляем одинакового врага на каждый путь
+            enemy_type = EnemyType(image_enemy_paths[enemy][0], **property_enemy_dict)
+            for path in self.paths:
+                wave.append({'path': path, 'enemy_type': enemy_type})
+
+        return wave
 
+    def endless_level(self, level) -> list:
+        """
+        Случайная волна бесконечного режима. Характеристики врагов считаются от базовых
+        и растут с уровнем без ограничения (скорость - до предела), размер волны ограничен.
+        :param level: Уровень сложности игры
+        :return: Список врагов со случайными параметрами
+        """
+        settings = self.game.settings
+        wave = []
+        for i in range(min(int(self.random_deviation(level * 2.5)), settings.max_wave_size)):
+            enemy = self.rng.randint(0, len(image_enemy_paths)-1)
+            base = image_enemy_paths[enemy][1]
+            enemy_type = EnemyType(
+                image_enemy_paths[enemy][0],
+                speed=self.random_deviation(base['speed']) * min(1 + level * 0.01, settings.max_speed_factor),
+                health=self.random_deviation(base['health']) * (1 + level * 0.1),
+                reward=self.random_deviation(base['reward']) * (1 + level * 0.05),
+            )
+            for path in self.paths:
+                wave.append({'path': path, 'enemy_type': enemy_type})
         return wave
 
     def start_next_wave(self):
-        """ Запускает следующую волну врагов. """
-        if (self.current_wave < len(self.waves)
-                and self.spawned_enemies >= len(self.waves[self.current_wave])):
+        """ Переходит к следующей волне, если текущая полностью выпущена. """
+        if self.spawned_enemies >= len(self.wave) and self.next_wave is not None:
+            self.current_wave += 1
+            self.wave = self.next_wave
+            self.next_wave = next(self.wave_stream, None)
             self.spawned_enemies = 0
             self.spawn_next_enemy()
 
     def spawn_next_enemy(self):
         """ Генерирует следующего врага текущей волны. """
-        if self.spawned_enemies < len(self.waves[self.current_wave]):
-            enemy_info = self.waves[self.current_wave][self.spawned_enemies]
+        if self.spawned_enemies < len(self.wave):
+            enemy_info = self.wave[self.spawned_enemies]
             new_enemy = Enemy(**enemy_info, game=self.game)
             self.enemies.add(new_enemy)
             self.spawned_enemies += 1
 
+    def tower_at(self, pos):
+        """ Возвращает башню, занимающую указанную позицию, или None. """
+        for tower in self.towers:
+            if tower.rect.collidepoint(pos):
+                return tower
+        return None
+
     def attempt_place_tower(self, mouse_pos, tower_type):
         """ Пытается разместить башню выбранного типа в позиции курсора. """
         if tower_type in tower_classes and self.game.settings.starting_money >= self.game.settings.tower_cost:
@@ -91,64 +159,74 @@ class Level:
                 self.game.settings.starting_money -= self.game.settings.tower_cost
                 new_tower = tower_classes[tower_type](grid_pos, self.game)
                 self.towers.add(new_tower)
-                self.game.last_event_text = 'Tower placed.'
-                print(self.game.last_event_text)
+                self.game.log_event('Tower placed.')
             else:
-                self.game.last_event_text = 'Invalid position for tower.'
-                print(self.game.last_event_text)
+                self.game.log_event('Invalid position for tower.')
         else:
-            self.game.last_event_text = 'Not enough money or unknown tower type.'
-            print(self.game.last_event_text)
+            self.game.log_event('Not enough money or unknown tower type.')
 
     def update(self):
         """ Обновляет состояние уровня, врагов, башен и пуль. """
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.get_ticks()
 
-        if self.current_wave < len(self.waves) and self.spawned_enemies < len(self.waves[self.current_wave]):
+        if self.spawned_enemies < len(self.wave):
             if current_time - self.last_spawn_time > self.spawn_delay:
-                enemy_info = self.waves[self.current_wave][self.spawned_enemies].copy()
-                enemy_info['game'] = self.game
-                new_enemy = Enemy(**enemy_info)
-                self.enemies.add(new_enemy)
-                self.spawned_enemies += 1
+                # На каждом пути одновременно появляется по врагу
+                wave = self.wave
+                for _ in range(min(len(self.paths), len(wave) - self.spawned_enemies)):
+                    enemy_info = wave[self.spawned_enemies].copy()
+                    enemy_info['game'] = self.game
+                    new_enemy = Enemy(**enemy_info)
+                    self.enemies.add(new_enemy)
+                    self.spawned_enemies += 1
                 self.last_spawn_time = current_time
 
-        collisions = pygame.sprite.groupcollide(self.bullets, self.enemies, True, False)
-        for bullet in collisions:
-            for enemy in collisions[bullet]:
-                enemy.take_damage(bullet.damage)
-
         self.enemies.update()
+        self.enemy_index.rebuild(self.enemies)
+
+        # Каждая пуля проверяет только врагов из соседних ячеек индекса
+        for bullet in self.bullets:
+            hit_enemies = self.enemy_index.query_rect(bullet.rect)
+            if hit_enemies:
+                bullet.kill()
+                self.ledger.record_hit(bullet, hit_enemies)
+                for enemy in hit_enemies:
+                    enemy.take_damage(bullet.damage)
+
         for tower in self.towers:
-            tower.update(self.enemies, current_time, self.bullets)
+            tower.update(self.enemy_index, current_time, self.bullets)
         self.bullets.update()
 
-        if (len(self.enemies) == 0 and self.current_wave < len(self.waves) - 1
-            and self.spawned_enemies >= len(self.waves[self.current_wave])):
-            self.current_wave += 1
-            self.start_next_wave()
-        elif (len(self.enemies) == 0 and self.current_wave == len(self.waves) - 1
-              and self.spawned_enemies >= len(self.waves[self.current_wave])):
-            self.all_waves_complete = True
+        if len(self.enemies) == 0 and self.spawned_enemies >= len(self.wave):
+            if self.next_wave is not None:
+                self.start_next_wave()
+            else:
+                self.all_waves_complete = True
 
     def draw_path(self, screen):
-        """ Отображает путь врагов. """
+        """ Отображает пути врагов. """
+        camera = self.game.camera
         if self.game.show_grid:
-            pygame.draw.lines(screen, (0, 128, 0), False, self.game.settings.enemy_path, 5)
+            for path in self.paths:
+                pygame.draw.lines(screen, (0, 128, 0), False, [camera.apply(point) for point in path], 5)
         if self.game.show_grid in [3, 4]:
-            for pos in self.game.settings.tower_positions:
-                pygame.draw.circle(screen, (128, 0, 0), pos, 10)
+            for pos in self.game.grid.visible_spots():
+                pygame.draw.circle(screen, (128, 0, 0), camera.apply(pos), 10)
 
     def draw(self, screen):
         """ Отрисовывает уровень, включая врагов, башни и пули. """
+        camera = self.game.camera
         self.draw_path(screen)
-        self.enemies.draw(screen)
-        self.towers.draw(screen)
-        self.bullets.draw(screen)
-        mouse_pos = pygame.mouse.get_pos()
+        self.enemies.draw(screen, camera)
+        self.towers.draw(screen, camera)
+        self.bullets.draw(screen, camera)
+        mouse_pos = camera.to_world(pygame.mouse.get_pos())
+        view = camera.rect
         for tower in self.towers:
+            if not view.colliderect(tower.rect):
+                continue
             tower.draw(screen)
             if tower.is_hovered(mouse_pos):
                 tower_stats_text = self.font.render(f"Damage: {tower.damage}, Range: {tower.tower_range}", True,
                                                     (255, 255, 255))
-                screen.blit(tower_stats_text, (tower.rect.x, tower.rect.y - 20))
+                screen.blit(tower_stats_text, camera.apply((tower.rect.x, tower.rect.y - 20)))
@@ -1,12 +1,16 @@
 # Главный файл, содержащий основной игровой цикл, обработку событий,
 # обновление состояний игры и отрисовку элементов игры.
 
+import argparse
+import atexit
 import sys
 
 import pygame
 
+from camera import Camera
 from grid import Grid
 from level import Level
+from recorder import FrameRecorder
 from settings import Settings, help_text
 
 
@@ -14,14 +18,18 @@ class TowerDefenseGame:
     """
     Главный класс игры, управляющий основным циклом игры, событиями, обновлениями состояний и отрисовкой.
     """
-    def __init__(self):
+    def __init__(self, preset='default', seed=None, endless=False):
         """
         Конструктор, инициализирует основные параметры игры, загружает ресурсы и создаёт объекты уровня и сетки.
+        Окно, шрифты, звуки и изображения создаются один раз и переживают перезапуск игры (restart).
+        :param preset: Название предустановки карты из settings.map_presets
+        :param seed: Начальное значение генератора случайных чисел
+        :param endless: Бесконечный режим: волны не заканчиваются, сложность растёт
         """
-        pygame.init()
-        self.settings = Settings()
-        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
-        pygame.display.set_caption("Tower Defense Game")
+        self.preset = preset
+        self.endless = endless
+        self.settings = Settings(preset, seed, endless)
+        self._init_display()
         self.clock = pygame.time.Clock()
 
         self.background = pygame.image.load(self.settings.background_image).convert()
@@ -30,6 +38,44 @@ class TowerDefenseGame:
 
         self.font = pygame.font.SysFont("Arial", 24)
 
+        self._load_sounds()
+
+        # Выводить ли сообщения о событиях в консоль
+        self.verbose = True
+        self.last_event_text = ''
+        # Запись кадров (FrameRecorder), None - запись выключена
+        self.recorder = None
+        self.show_grid = 2
+
+        self._start_game()
+
+    def _start_game(self):
+        """ Создаёт состояние новой игры: камеру, уровень и сетку. """
+        self.last_event_text = ''
+        self.camera = Camera(self.settings)
+        self.level = Level(self, self.settings.waves_count)
+        self.grid = Grid(self)
+
+        self.selected_tower_type = 'basic'
+        self.is_game_over = False
+        self.show_help = True
+
+    def restart(self, seed=None):
+        """
+        Начинает новую игру без повторной загрузки ресурсов: пересоздаются только настройки, уровень и сетка.
+        :param seed: Начальное значение генератора случайных чисел
+        """
+        self.settings = Settings(self.preset, seed, self.endless)
+        self._start_game()
+
+    def _init_display(self):
+        """ Инициализирует pygame и создаёт окно игры. """
+        pygame.init()
+        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
+        pygame.display.set_caption("Tower Defense Game")
+
+    def _load_sounds(self):
+        """ Загружает звуки и запускает фоновую музыку. """
         self.background_music = pygame.mixer.Sound(self.settings.background_music)
         self.shoot_sound = pygame.mixer.Sound(self.settings.shoot_sound)
         self.enemy_hit_sound = pygame.mixer.Sound(self.settings.enemy_hit_sound)
@@ -40,15 +86,15 @@ class TowerDefenseGame:
         self.background_music.set_volume(0.15)
         self.background_music.play(loops=-1)
 
-        self.level = Level(self)
-        self.grid = Grid(self)
-        self.show_grid = 2
+    def log_event(self, text):
+        """ Запоминает последнее событие игры и выводит его в консоль. """
+        self.last_event_text = text
+        if self.verbose:
+            print(text)
 
-        self.selected_tower_type = 'basic'
-        self.is_game_over = False
-        self.show_help = True
-
-        self.last_event_text = ''
+    def get_ticks(self):
+        """ Текущее игровое время в мс. """
+        return pygame.time.get_ticks()
 
     def game_over(self):
         """ Обрабатывает условия окончания игры. """
@@ -56,7 +102,7 @@ class TowerDefenseGame:
 
     def is_position_inside(self, pos):
         """ Проверяет, находится ли позиция в пределах игрового поля. """
-        return 0 <= pos.x <= self.settings.screen_width and 0 <= pos.y <= self.settings.screen_height
+        return 0 <= pos.x <= self.settings.world_width and 0 <= pos.y <= self.settings.world_height
 
     def _check_events(self):
         """ Обрабатывает игровые события, такие как нажатие клавиш и клики мыши. """
@@ -83,38 +129,31 @@ class TowerDefenseGame:
                     self.is_game_over = True
                 elif event.key == pygame.K_SPACE:           # нажата клавиша "пробел"
                     self.show_grid = (self.show_grid + 1) % 5
-                    self.last_event_text = "Show/Hide grid"
-                    print(self.last_event_text)
+                    self.log_event("Show/Hide grid")
                 elif event.key == pygame.K_1:               # нажата клавиша "1"
                     self.selected_tower_type = 'basic'
-                    self.last_event_text = "Selected basic tower."
-                    print(self.last_event_text)
+                    self.log_event("Selected basic tower.")
                 elif event.key == pygame.K_2:               # нажата клавиша "2"
                     self.selected_tower_type = 'sniper'
-                    self.last_event_text = "Selected sniper tower."
-                    print(self.last_event_text)
+                    self.log_event("Selected sniper tower.")
                 elif event.key == pygame.K_3:               # нажата клавиша "3"
                     self.selected_tower_type = 'money'
-                    self.last_event_text = "Selected money tower."
-                    print(self.last_event_text)
+                    self.log_event("Selected money tower.")
                 elif event.key == pygame.K_0:               # нажата клавиша "0"
                     # Апгрейд башни
                     self.selected_tower_type = 'upgrade'
-                    self.last_event_text = "Selected upgrade tower."
-                    print(self.last_event_text)
+                    self.log_event("Selected upgrade tower.")
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not self.is_game_over:
                 # Не выбран никакой тип башни
                 if not self.selected_tower_type:
-                    self.last_event_text = "No tower type selected."
-                    print(self.last_event_text)
+                    self.log_event("No tower type selected.")
                     return
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = self.camera.to_world(pygame.mouse.get_pos())
                 for tower in self.level.towers:
                     if tower.rect.collidepoint(mouse_pos):
                        # Позиция занята
                         if self.selected_tower_type != 'upgrade':
-                            self.last_event_text = "The position is occupied."
-                            print(self.last_event_text)
+                            self.log_event("The position is occupied.")
                             return
                         else:
                             # Апгрейд башни если нашли башню
@@ -125,8 +164,7 @@ class TowerDefenseGame:
                         self.level.attempt_place_tower(mouse_pos, self.selected_tower_type)
                     else:
                         # Нет башни для апгрейда
-                        self.last_event_text = "There is no tower to upgrade."
-                        print(self.last_event_text)
+                        self.log_event("There is no tower to upgrade.")
 
 
     def _update_game(self):
@@ -152,8 +190,20 @@ class TowerDefenseGame:
 
         self.screen.blit(game_over_render, game_over_rect)
 
+    def _draw_background(self):
+        """ Заполняет видимую область карты фоном, повторяя его по всему миру. """
+        width, height = self.background.get_size()
+        for x in range(-(self.camera.x % width), self.settings.screen_width, width):
+            for y in range(-(self.camera.y % height), self.settings.screen_height, height):
+                self.screen.blit(self.background, (x, y))
+
     def _draw(self):
         """ Управляет отрисовкой всех элементов игры. """
+        self._draw_frame()
+        pygame.display.flip()
+
+    def _draw_frame(self):
+        """ Отрисовывает кадр игры на экранной поверхности. """
         if self.is_game_over:
             self._draw_game_over_screen()
         elif self.show_help:
@@ -163,7 +213,7 @@ class TowerDefenseGame:
                 help_text_label = self.font.render(help_list[i], True, (255, 255, 255))
                 self.screen.blit(help_text_label, (10, 30*(i+1)))
         else:
-            self.screen.blit(self.background, (0, 0))
+            self._draw_background()
             self.level.draw(self.screen)
             if self.show_grid in [2, 4]:
                 self.grid.draw()
@@ -172,8 +222,11 @@ class TowerDefenseGame:
             tower_text = self.font.render(
                 f"Selected Tower: {self.selected_tower_type if self.selected_tower_type else 'None'}", True,
                 (255, 255, 255))
-            waves_text = self.font.render(f"Waves Left: {len(self.level.waves) - self.level.current_wave}", True,
-                                          (255, 255, 255))
+            if self.level.waves_count is None:
+                waves_caption = f"Wave: {self.level.current_wave + 1} (endless)"
+            else:
+                waves_caption = f"Waves Left: {self.level.waves_count - self.level.current_wave}"
+            waves_text = self.font.render(waves_caption, True, (255, 255, 255))
             enemies_text = self.font.render(f"Enemies Left: {len(self.level.enemies)}", True, (255, 255, 255))
             last_event_text = self.font.render(f"Last Event: {self.last_event_text}", True, (255, 255, 255))
 
@@ -186,13 +239,15 @@ class TowerDefenseGame:
             if self.level.all_waves_complete:
                 self._draw_win_screen()
 
-        pygame.display.flip()
+        if self.recorder is not None:
+            self.recorder.capture(self.screen)
 
     def run_game(self):
         """ Запускает основной игровой цикл. """
         while True:
             self._check_events()
             if not self.show_help and not self.is_game_over:
+                self.camera.update(pygame.key.get_pressed())
                 self._update_game()
 
                 if len(self.level.enemies) == 0 and not self.level.all_waves_complete:
@@ -205,6 +260,17 @@ class TowerDefenseGame:
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tower Defense Game')
+    parser.add_argument('--preset', default='default', help='Предустановка карты: default, large или stress')
+    parser.add_argument('--endless', action='store_true', help='Бесконечный режим')
+    parser.add_argument('--record', metavar='DIR', help='Записывать кадры игры в каталог')
+    parser.add_argument('--record-format', choices=('png', 'raw'), default='raw',
+                        help='png - отдельные файлы, raw - несжатое видео для ffmpeg')
+    args = parser.parse_args()
+    td_game = TowerDefenseGame(args.preset, endless=args.endless)
+    if args.record:
+        td_game.recorder = FrameRecorder(args.record, td_game.screen.get_size(), args.record_format)
+        atexit.register(td_game.recorder.close)
     while True:
-        td_game = TowerDefenseGame()
         td_game.run_game()
+        td_game.restart()
@@ -0,0 +1,91 @@
+# Отчёт о памяти на один игровой объект: создаёт много живых врагов и пуль
+# и измеряет прирост памяти Python (tracemalloc) и процесса (RSS, включая изображения SDL).
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+from bullet import Bullet
+from enemy import Enemy, EnemyType
+from entity import EntityGroup
+from settings import image_enemy_paths
+from simulator import HeadlessGame
+
+
+def process_memory():
+    """
+    Текущий размер памяти процесса (RSS) в байтах.
+    :return: Размер в байтах или None, если текущий размер узнать нельзя (нет /proc)
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, AttributeError, ValueError):
+        return None
+
+
+def peak_memory():
+    """
+    Наибольший размер памяти процесса (пиковый RSS) в байтах.
+    Подходит только для итогового отчёта: разность двух пиковых значений ничего не говорит о приросте.
+    :return: Размер в байтах или None, если модуля resource нет (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss в байтах на macOS и в кБ на остальных системах
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(create, count):
+    """
+    Создаёт count живых объектов и измеряет прирост памяти.
+    :param create: Функция, создающая один объект
+    :param count: Количество объектов
+    :return: Байт на объект по tracemalloc и по RSS (None, если RSS узнать нельзя)
+    """
+    group = EntityGroup()
+    group.add(create())
+    gc.collect()
+    rss_before = process_memory()
+    tracemalloc.start()
+    for _ in range(count):
+        group.add(create())
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    gc.collect()
+    rss_after = process_memory()
+    group.empty()
+    if rss_before is None or rss_after is None:
+        return python_bytes / count, None
+    return python_bytes / count, (rss_after - rss_before) / count
+
+
+def report(count=10000):
+    """ Печатает память на одного врага и одну пулю при count живых объектах. """
+    game = HeadlessGame('stress', 0)
+    path = game.level.paths[0]
+    image_path, properties = image_enemy_paths[0]
+    enemy_type = EnemyType(image_path, **properties)
+    entities = {
+        'enemy': lambda: Enemy(path, enemy_type, game),
+        'bullet': lambda: Bullet((100, 100), (500, 500), 20, game, 'assets/bullets/basic_bullet.png'),
+    }
+    for name, create in entities.items():
+        python_bytes, rss_bytes = measure(create, count)
+        rss_text = 'RSS unavailable' if rss_bytes is None else f'{rss_bytes:.0f} B/entity (RSS)'
+        print(f'{name}: {python_bytes:.0f} B/entity (Python objects), {rss_text} at {count} live entities')
+    peak = peak_memory()
+    if peak is not None:
+        print(f'peak process memory: {peak / 2 ** 20:.1f} MB')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Память на один игровой объект')
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+    report(args.count)
@@ -0,0 +1,175 @@
+# Запись кадров игры на диск. Кадр копируется в одну из заранее выделенных ячеек кольцевого буфера,
+# кодирование и запись выполняет фоновый поток или процесс. Если запись не успевает, кадры пропускаются,
+# а игровой цикл не ждёт.
+
+import argparse
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import pygame
+
+# Формат пикселей ячеек буфера и соответствующий ему формат ffmpeg
+pixel_format = 'RGBX'
+ffmpeg_pixel_format = 'rgb0'
+# Частота кадров игры
+game_fps = 60
+
+
+def _write_frames(directory, memory_name, size, frame_format, filled, free):
+    """
+    Цикл записи кадров: берёт номер заполненной ячейки, записывает кадр и возвращает ячейку в свободные.
+    Выполняется в фоновом потоке или процессе.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    frame_bytes = size[0] * size[1] * 4
+    raw_file = index_file = None
+    if frame_format == 'raw':
+        # Новая запись заменяет предыдущую; номера записанных кадров игры - в frames_index.txt
+        raw_file = open(os.path.join(directory, 'frames.raw'), 'wb')
+        index_file = open(os.path.join(directory, 'frames_index.txt'), 'w')
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            slot, frame_number = item
+            data = memory.buf[slot * frame_bytes:(slot + 1) * frame_bytes]
+            if raw_file is not None:
+                raw_file.write(data)
+                index_file.write(f'{frame_number}\n')
+            else:
+                frame = pygame.image.frombuffer(data, size, pixel_format)
+                pygame.image.save(frame, os.path.join(directory, f'frame_{frame_number:06d}.png'))
+                del frame
+            data.release()
+            free.put(slot)
+    finally:
+        if raw_file is not None:
+            raw_file.close()
+            index_file.close()
+        memory.close()
+
+
+class FrameRecorder:
+    """ Записывает кадры с экранной поверхности (окна или поверхности в памяти) в PNG или несжатое видео. """
+    def __init__(self, directory, size, frame_format='png', buffer_size=8, every=1, use_process=False):
+        """
+        Выделяет кольцевой буфер и запускает фоновую запись.
+        :param directory: Каталог для кадров
+        :param size: Размер кадра (ширина, высота)
+        :param frame_format: 'png' - отдельные файлы, 'raw' - один файл frames.raw с несжатыми кадрами
+        :param buffer_size: Количество ячеек буфера
+        :param every: Записывать каждый every-й кадр (от 1 до 60)
+        :param use_process: Записывать в отдельном процессе вместо потока
+        """
+        if not 1 <= every <= game_fps:
+            raise ValueError(f'every must be between 1 and {game_fps}, got {every}')
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+        self.frame_format = frame_format
+        self.every = every
+        self.frame_number = 0
+        # Счётчики: записанные в буфер и пропущенные кадры
+        self.captured = 0
+        self.dropped = 0
+
+        frame_bytes = size[0] * size[1] * 4
+        self.memory = shared_memory.SharedMemory(create=True, size=frame_bytes * buffer_size)
+        # Поверхности поверх ячеек буфера: blit копирует кадр прямо в разделяемую память
+        self.slots = [pygame.image.frombuffer(self.memory.buf[i * frame_bytes:(i + 1) * frame_bytes],
+                                              size, pixel_format)
+                      for i in range(buffer_size)]
+
+        if use_process:
+            context = multiprocessing.get_context('spawn')
+            self.filled, self.free = context.Queue(), context.Queue()
+            worker_class = context.Process
+        else:
+            self.filled, self.free = queue.Queue(), queue.Queue()
+            worker_class = threading.Thread
+        for slot in range(buffer_size):
+            self.free.put(slot)
+        self.writer = worker_class(target=_write_frames, daemon=True,
+                                   args=(directory, self.memory.name, size, frame_format, self.filled, self.free))
+        self.writer.start()
+
+        if frame_format == 'raw':
+            self._write_raw_description()
+
+    def _write_raw_description(self):
+        """
+        Сохраняет рядом с frames.raw команду ffmpeg для перекодирования в видео и количество пропущенных кадров.
+        Пропущенных кадров в frames.raw нет, поэтому при пропусках видео идёт быстрее игры;
+        номера записанных кадров игры - в frames_index.txt.
+        """
+        with open(os.path.join(self.directory, 'frames.txt'), 'w') as description:
+            description.write(f'ffmpeg -f rawvideo -pix_fmt {ffmpeg_pixel_format} '
+                              f'-s {self.size[0]}x{self.size[1]} -r {game_fps}/{self.every} '
+                              f'-i frames.raw -pix_fmt yuv420p video.mp4\n')
+            description.write(f'captured {self.captured}, dropped {self.dropped}\n')
+            if self.dropped:
+                description.write('Dropped frames are missing from frames.raw, the video plays faster than the game. '
+                                  'Game frame numbers of the recorded frames are listed in frames_index.txt.\n')
+
+    def capture(self, surface):
+        """
+        Копирует кадр в свободную ячейку буфера и передаёт его на запись.
+        :param surface: Поверхность с готовым кадром
+        :return: True, если кадр принят, False - если пропущен
+        """
+        self.frame_number += 1
+        if self.frame_number % self.every:
+            return False
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            # Запись не успевает - пропускаем кадр
+            self.dropped += 1
+            return False
+        self.slots[slot].blit(surface, (0, 0))
+        self.filled.put((slot, self.frame_number))
+        self.captured += 1
+        return True
+
+    def close(self):
+        """ Дожидается записи принятых кадров и освобождает буфер. """
+        if self.writer is None:
+            return
+        self.filled.put(None)
+        self.writer.join()
+        self.writer = None
+        self.slots = []
+        self.memory.close()
+        self.memory.unlink()
+        if self.frame_format == 'raw':
+            self._write_raw_description()
+
+
+if __name__ == '__main__':
+    from simulator import HeadlessGame
+
+    parser = argparse.ArgumentParser(description='Запись кадров игры без окна и замер затрат на запись')
+    parser.add_argument('directory')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--format', choices=('png', 'raw'), default='png')
+    parser.add_argument('--every', type=int, default=1)
+    parser.add_argument('--process', action='store_true', help='Записывать в отдельном процессе')
+    args = parser.parse_args()
+
+    game = HeadlessGame(seed=0)
+    game.level.attempt_place_tower((200, 300), 'basic')
+    recorder = FrameRecorder(args.directory, game.screen.get_size(), args.format, every=args.every,
+                             use_process=args.process)
+    game.recorder = recorder
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        game.step()
+    elapsed = time.perf_counter() - start
+    recorder.close()
+    print(f'{args.frames} frames in {elapsed:.2f} s ({elapsed / args.frames * 1000:.2f} ms/frame), '
+          f'captured {recorder.captured}, dropped {recorder.dropped}')
@@ -0,0 +1,36 @@
+# Общие ресурсы игры: изображения загружаются один раз и используются всеми объектами.
+
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=None)
+def load_image(path, alpha=True):
+    """
+    Загружает изображение один раз, повторные вызовы возвращают ту же поверхность.
+    Возвращаемую поверхность нельзя изменять - она общая для всех объектов.
+    :param path: Путь к изображению
+    :param alpha: Преобразовать с прозрачностью (convert_alpha) или без (convert)
+    :return: Поверхность с изображением
+    """
+    image = pygame.image.load(path)
+    return image.convert_alpha() if alpha else image.convert()
+
+
+def rotate_image(image, angle, step=5):
+    """
+    Повёрнутое изображение. Угол округляется до step градусов,
+    поэтому на каждое изображение хранится не больше 360 / step поворотов.
+    :param image: Исходная поверхность (из load_image)
+    :param angle: Угол поворота в градусах
+    :param step: Шаг округления угла
+    :return: Повёрнутая поверхность
+    """
+    return _rotated_image(image, round(angle / step) * step % 360)
+
+
+@lru_cache(maxsize=1024)
+def _rotated_image(image, angle):
+    """ Кеш поворотов по уже округлённому углу. """
+    return pygame.transform.rotate(image, angle)
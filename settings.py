@@ -1,7 +1,7 @@
 # файл настроек, содержит параметры конфигурации игры, такие как размеры экрана,
 # стоимость и параметры башен, пути к ресурсам и т.д.
 from tower import BasicTower, SniperTower, MoneyTower
-from random import choice
+from random import Random
 
 # Башни
 tower_classes = {
@@ -18,6 +18,50 @@ enemy_path_list = [
     [(30, 400), (300, 200), (600, 600), (900, 200), (1150, 600)],
 ]
 
+# Предустановки карт: переопределяют параметры Settings.
+# 'large' - большая карта с прокруткой, 'stress' - нагрузочный режим с тысячами врагов
+map_presets = {
+    'default': {},
+    'large': {
+        'world_width': 3840,
+        'world_height': 2560,
+        'rows': 40,
+        'cols': 60,
+        'paths_count': 4,
+    },
+    'stress': {
+        'world_width': 7680,
+        'world_height': 5120,
+        'rows': 80,
+        'cols': 120,
+        'paths_count': 8,
+        'starting_money': 1000000,
+    },
+}
+
+
+def generate_lane_path(world_width, world_height, lane, lanes_count, rng, turns=8):
+    """
+    Генерирует случайный путь врагов слева направо внутри своей полосы карты.
+    :param world_width: Ширина карты
+    :param world_height: Высота карты
+    :param lane: Номер полосы
+    :param lanes_count: Количество полос
+    :param rng: Генератор случайных чисел
+    :param turns: Количество поворотов пути
+    :return: Список точек пути
+    """
+    lane_height = world_height / lanes_count
+    top = lane * lane_height + lane_height * 0.1
+    bottom = (lane + 1) * lane_height - lane_height * 0.1
+    step = (world_width - 80) / (turns + 1)
+    path = [(30, int(rng.uniform(top, bottom)))]
+    for i in range(1, turns + 1):
+        path.append((int(30 + step * i), int(rng.uniform(top, bottom))))
+    path.append((world_width - 50, int(rng.uniform(top, bottom))))
+    return path
+
+
 # Список врагов
 image_enemy_paths = [
     ['assets/enemies/basic_enemy.png', {'speed': 1, 'health': 100, 'reward': 10,}],
@@ -41,6 +85,7 @@ help_text = """Это игра в жанре "Tower Defense", где игрок
    Башни устанавливать можно только на свободные места.
 
    Клавиша <Пробел> - показать/убрать позиции расположения башен.
+   Клавиши со стрелками - прокрутка большой карты.
    
    Клавиши <Enter>, <Пробел>, <F2>, <N> и <G> - начать новую игру.
    Клавиша <F2> во время игры завершает текущую игру. Можно начать новую игру.
@@ -48,9 +93,17 @@ help_text = """Это игра в жанре "Tower Defense", где игрок
 """
 
 class Settings:
-    def __init__(self):
+    def __init__(self, preset='default', seed=None, endless=False):
+        self.preset = preset
+        # Генератор случайных чисел игры, задается seed для воспроизводимых прогонов
+        self.rng = Random(seed)
         self.screen_width = 1200
         self.screen_height = 800
+        # Размер игрового мира, по умолчанию совпадает с экраном
+        self.world_width = self.screen_width
+        self.world_height = self.screen_height
+        # Скорость прокрутки камеры в пикселях за кадр
+        self.camera_speed = 20
         self.bg_color = (150, 150, 0)
         self.text_color = (250, 250, 250)
 
@@ -62,7 +115,8 @@ class Settings:
         self.tower_upgrade_cost = 150
         self.tower_sell_percentage = 0.75
 
-        self.enemy_path = choice(enemy_path_list)
+        # Количество одновременных путей (полос) врагов
+        self.paths_count = 1
 
         self.tower_sprites = {
             'basic': 'assets/towers/basic_tower.png',
@@ -83,6 +137,22 @@ class Settings:
         self.starting_money = 500
         self.lives = 20
 
+        # Количество волн, None - бесконечный режим
+        self.waves_count = None if endless else 30
+        # Бесконечный режим: наибольшее число врагов волны на одном пути
+        # и наибольшее увеличение скорости врагов
+        self.max_wave_size = 60
+        self.max_speed_factor = 2.5
+
+        for key, value in map_presets[preset].items():
+            setattr(self, key, value)
+
+        if self.world_width == self.screen_width and self.world_height == self.screen_height:
+            self.enemy_paths = self.rng.sample(enemy_path_list, self.paths_count)
+        else:
+            self.enemy_paths = [generate_lane_path(self.world_width, self.world_height, lane, self.paths_count, self.rng)
+                                for lane in range(self.paths_count)]
+
         self.tower_positions = [
             (x * self.grid_size[0] + self.grid_size[0] // 2, y * self.grid_size[1] + self.grid_size[1] // 2)
             for x in range(1, self.cols) for y in range(3, self.rows)]
@@ -0,0 +1,189 @@
+# Игра без окна и звука: используется для нагрузочных замеров
+# и автоматических прогонов. Кадры рисуются на поверхность в памяти.
+
+import argparse
+import os
+import time
+
+import pygame
+
+from enemy import Enemy, EnemyType
+from main import TowerDefenseGame
+from settings import tower_classes, image_enemy_paths
+
+
+class SilentSound:
+    """ Звук, который ничего не воспроизводит. """
+    def play(self, *args, **kwargs):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+class HeadlessGame(TowerDefenseGame):
+    """
+    Игра без окна, звука и обработки событий. Состояние продвигается вызовом step(),
+    игровое время не зависит от реального и растёт на frame_ms за кадр.
+    """
+    def __init__(self, preset='default', seed=None, frame_ms=1000 / 60, endless=False):
+        self.frame_ms = frame_ms
+        super().__init__(preset, seed, endless)
+        self.verbose = False
+
+    def _start_game(self):
+        """ Новая игра начинается сразу, без экрана приветствия, игровое время - с нуля. """
+        self.ticks = 0
+        super()._start_game()
+        self.show_help = False
+
+    def _init_display(self):
+        """ Инициализирует pygame без окна, кадры рисуются на поверхность в памяти. """
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+        pygame.init()
+        # Режим экрана нужен для convert()/convert_alpha() при загрузке изображений
+        pygame.display.set_mode((1, 1))
+        self.screen = pygame.Surface((self.settings.screen_width, self.settings.screen_height))
+
+    def _load_sounds(self):
+        """ Заменяет все звуки беззвучными. """
+        self.background_music = SilentSound()
+        self.shoot_sound = SilentSound()
+        self.enemy_hit_sound = SilentSound()
+        self.put_sound = SilentSound()
+        self.oreshnik_sound = SilentSound()
+        self.money_sound = SilentSound()
+
+    def get_ticks(self):
+        """ Игровое время в мс. """
+        return self.ticks
+
+    def step(self, render=True):
+        """
+        Один кадр игры: обновление состояния и, при необходимости, отрисовка.
+        :param render: Рисовать ли кадр на self.screen
+        """
+        self.ticks += self.frame_ms
+        if not self.is_game_over:
+            self._update_game()
+            if len(self.level.enemies) == 0 and not self.level.all_waves_complete:
+                self.level.start_next_wave()
+        if render:
+            self._draw_frame()
+
+
+def spawn_on_path(game, path, enemy_types):
+    """
+    Создаёт врага случайного типа в случайной точке пути, а не в его начале.
+    :param game: Игра
+    :param path: Путь врага
+    :param enemy_types: Список типов врагов
+    :return: Созданный враг
+    """
+    rng = game.settings.rng
+    enemy = Enemy(path, rng.choice(enemy_types), game)
+    segment = rng.randint(0, len(path) - 2)
+    start, end = pygame.math.Vector2(path[segment]), pygame.math.Vector2(path[segment + 1])
+    enemy.start_segment(segment)
+    enemy.position = start.lerp(end, rng.random())
+    enemy.rect.center = enemy.position
+    game.level.enemies.add(enemy)
+    return enemy
+
+
+def run_stress(preset='stress', enemies=5000, towers=400, frames=300, seed=0, ledger=True):
+    """
+    Нагрузочный замер: карта заполняется башнями и врагами, измеряется время кадра.
+    :param preset: Предустановка карты
+    :param enemies: Количество врагов, поддерживаемое на карте
+    :param towers: Количество башен
+    :param frames: Количество замеряемых кадров
+    :param seed: Начальное значение генератора случайных чисел
+    :param ledger: Не стрелять по врагам, которых уже уничтожат летящие пули
+    :return: Словарь с результатами замера
+    """
+    game = HeadlessGame(preset, seed)
+    level = game.level
+    level.ledger.skip_covered = ledger
+    enemy_types = [EnemyType(image_path, **properties) for image_path, properties in image_enemy_paths]
+    game.camera.move(game.settings.world_width // 2, game.settings.world_height // 2)
+
+    spots = game.settings.tower_positions
+    for i, spot in enumerate(spots[::max(1, len(spots) // towers)][:towers]):
+        tower_type = 'sniper' if i % 3 == 0 else 'basic'
+        level.towers.add(tower_classes[tower_type](spot, game))
+    for i in range(enemies):
+        spawn_on_path(game, level.paths[i % len(level.paths)], enemy_types)
+
+    frame_times = []
+    for _ in range(frames):
+        # Поддерживаем постоянное количество врагов на карте
+        for i in range(enemies - len(level.enemies)):
+            spawn_on_path(game, level.paths[i % len(level.paths)], enemy_types)
+        game.is_game_over = False
+        start = time.perf_counter()
+        game.step()
+        frame_times.append(time.perf_counter() - start)
+
+    frame_times.sort()
+    return {
+        'preset': preset,
+        'enemies': len(level.enemies),
+        'towers': len(level.towers),
+        'bullets': len(level.bullets),
+        'mean_ms': sum(frame_times) / len(frame_times) * 1000,
+        'p95_ms': frame_times[int(len(frame_times) * 0.95)] * 1000,
+        **level.ledger.stats(),
+    }
+
+
+def measure_restarts(preset='default', restarts=50):
+    """
+    Сравнивает время создания новой игры и перезапуска существующей.
+    :param preset: Предустановка карты
+    :param restarts: Количество повторов
+    :return: Словарь со средним временем в мс и приростом памяти процесса (None, если RSS узнать нельзя)
+    """
+    from memory_report import process_memory
+
+    start = time.perf_counter()
+    for i in range(restarts):
+        game = HeadlessGame(preset, i)
+    construct_ms = (time.perf_counter() - start) / restarts * 1000
+
+    rss_before = process_memory()
+    start = time.perf_counter()
+    for i in range(restarts):
+        game.restart(i)
+    restart_ms = (time.perf_counter() - start) / restarts * 1000
+    rss_after = process_memory()
+    return {
+        'construct_ms': construct_ms,
+        'restart_ms': restart_ms,
+        'restart_rss_growth': None if rss_before is None or rss_after is None else rss_after - rss_before,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Нагрузочный замер времени кадра без окна')
+    parser.add_argument('--preset', default='stress')
+    parser.add_argument('--enemies', type=int, default=5000)
+    parser.add_argument('--towers', type=int, default=400)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-ledger', action='store_true', help='Стрелять без учёта летящих пуль')
+    parser.add_argument('--restarts', type=int, default=0, help='Замерить время перезапуска игры вместо нагрузки')
+    args = parser.parse_args()
+    if args.restarts:
+        result = measure_restarts(args.preset, args.restarts)
+        growth = result['restart_rss_growth']
+        growth_text = 'unavailable' if growth is None else f'{growth / 1024:.0f} KiB'
+        print(f"{args.preset}: new game {result['construct_ms']:.2f} ms, restart {result['restart_ms']:.2f} ms, "
+              f"RSS growth over {args.restarts} restarts {growth_text}")
+        raise SystemExit
+    result = run_stress(args.preset, args.enemies, args.towers, args.frames, args.seed, not args.no_ledger)
+    print(f"{result['preset']}: {result['enemies']} enemies, {result['towers']} towers, {result['bullets']} bullets; "
+          f"frame mean {result['mean_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms")
+    print(f"shots {result['shots_fired']}, hits {result['hits']}, wasted {result['wasted_bullets']}, "
+          f"overkill damage {result['overkill_damage']}")
@@ -0,0 +1,129 @@
+# Длительный прогон игр без окна подряд с отслеживанием памяти: после каждой игры снимается
+# снимок tracemalloc и считаются объекты по типам. В конце выводятся места с наибольшим ростом выделений,
+# а при росте памяти выше порога прогон завершается с ошибкой.
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from random import Random
+
+from memory_report import process_memory
+from settings import tower_classes
+from simulator import HeadlessGame
+
+
+def play_game(game, rng, max_frames, render_every):
+    """
+    Играет одну игру простым агентом: ставит башни на случайные свободные места и улучшает их.
+    :param game: Игра (HeadlessGame)
+    :param rng: Генератор случайных чисел агента
+    :param max_frames: Наибольшая длительность игры в кадрах
+    :param render_every: Рисовать каждый render_every-й кадр
+    :return: Количество сыгранных кадров
+    """
+    level = game.level
+    positions = game.settings.tower_positions
+    tower_types = list(tower_classes)
+    for frame in range(1, max_frames + 1):
+        if frame % 60 == 0:
+            pos = rng.choice(positions)
+            tower = level.tower_at(pos)
+            if tower is None:
+                level.attempt_place_tower(pos, rng.choice(tower_types))
+            else:
+                tower.upgrade()
+        game.step(render=frame % render_every == 0)
+        if game.is_game_over or level.all_waves_complete:
+            break
+    return frame
+
+
+def object_counts():
+    """ Количество объектов, отслеживаемых сборщиком мусора, по именам типов. """
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def object_growth(counts, baseline_counts, min_growth=50):
+    """ Типы, количество объектов которых выросло больше чем на min_growth с базового замера. """
+    return [(name, count) for name, count in (counts - baseline_counts).most_common(3) if count > min_growth]
+
+
+def soak(games=20, hours=None, preset='default', endless=False, max_frames=20000, render_every=10,
+         warmup=2, max_growth_mb=10.0, top=10, seed=0):
+    """
+    Играет игры подряд, перезапуская одну и ту же игру, и следит за ростом памяти.
+    :param games: Количество игр (если не задано hours)
+    :param hours: Длительность прогона в часах
+    :param warmup: Количество игр до снятия базового снимка (заполнение кешей)
+    :param max_growth_mb: Допустимый рост памяти после разогрева, МБ
+    :param top: Сколько мест выделения памяти выводить
+    :return: True, если рост памяти не превысил порог
+    """
+    tracemalloc.start()
+    rng = Random(seed)
+    game = HeadlessGame(preset, seed, endless=endless)
+    deadline = time.monotonic() + hours * 3600 if hours else None
+    baseline = baseline_counts = None
+    baseline_traced = 0
+    baseline_rss = None
+    number = 0
+    while (deadline is None and number < games + warmup) or (deadline is not None and time.monotonic() < deadline):
+        frames = play_game(game, rng, max_frames, render_every)
+        wave = game.level.current_wave
+        number += 1
+        game.restart(seed + number)
+        gc.collect()
+        traced = tracemalloc.get_traced_memory()[0]
+        rss = process_memory()
+        if number == warmup or (warmup == 0 and baseline is None):
+            baseline = tracemalloc.take_snapshot()
+            baseline_traced, baseline_rss = traced, rss
+            baseline_counts = object_counts()
+        growth = ''
+        if baseline_counts is not None:
+            grown = object_growth(object_counts(), baseline_counts)
+            growth = ', '.join(f'{name} +{count}' for name, count in grown) or 'no object growth'
+        rss_text = 'RSS unavailable' if rss is None else f'RSS {rss / 2 ** 20:.1f} MB'
+        print(f'game {number}: {frames} frames, wave {wave}, traced {traced / 2 ** 20:.2f} MB, '
+              f'{rss_text}; {growth}', flush=True)
+
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    if baseline is None:
+        print('Not enough games to compare against the baseline')
+        return True
+
+    print(f'\nTop {top} growing allocation sites since game {warmup or 1}:')
+    for stat in snapshot.compare_to(baseline, 'lineno')[:top]:
+        print(f'  {stat}')
+    traced_growth = (traced - baseline_traced) / 2 ** 20
+    # Без текущего RSS (нет /proc) проверяется только рост памяти Python
+    if rss is None or baseline_rss is None:
+        print(f'\nGrowth after warm-up: traced {traced_growth:+.2f} MB, RSS unavailable '
+              f'(limit {max_growth_mb} MB)')
+        return traced_growth <= max_growth_mb
+    rss_growth = (rss - baseline_rss) / 2 ** 20
+    print(f'\nGrowth after warm-up: traced {traced_growth:+.2f} MB, RSS {rss_growth:+.1f} MB '
+          f'(limit {max_growth_mb} MB)')
+    return traced_growth <= max_growth_mb and rss_growth <= max_growth_mb
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Длительный прогон игр подряд с отслеживанием утечек памяти')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--hours', type=float, help='Длительность прогона в часах вместо количества игр')
+    parser.add_argument('--preset', default='default')
+    parser.add_argument('--endless', action='store_true')
+    parser.add_argument('--max-frames', type=int, default=20000, help='Наибольшая длительность одной игры в кадрах')
+    parser.add_argument('--render-every', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--max-growth-mb', type=float, default=10.0)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    ok = soak(args.games, args.hours, args.preset, args.endless, args.max_frames, args.render_every,
+              args.warmup, args.max_growth_mb, args.top, args.seed)
+    sys.exit(0 if ok else 1)
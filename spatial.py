@@ -0,0 +1,72 @@
+# Пространственный индекс объектов на карте. Позволяет башням и пулям
+# проверять только ближайших врагов, а не всех врагов на карте.
+
+
+class SpatialHash:
+    """ Разбивает карту на квадратные ячейки и хранит объекты по ячейкам их центров. """
+    def __init__(self, cell_size=128):
+        """ Инициализирует пустой индекс. """
+        self.cell_size = cell_size
+        self.cells = {}
+        # Половина наибольшего размера объекта, на нее расширяется область поиска
+        self.margin = 0
+
+    def rebuild(self, sprites):
+        """
+        Перестраивает индекс по текущим позициям объектов.
+        :param sprites: Объекты с атрибутами position и rect
+        """
+        cell_size = self.cell_size
+        cells = {}
+        margin = 0
+        for sprite in sprites:
+            key = (int(sprite.position.x // cell_size), int(sprite.position.y // cell_size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [sprite]
+            else:
+                bucket.append(sprite)
+            if sprite.rect.width > margin:
+                margin = sprite.rect.width
+            if sprite.rect.height > margin:
+                margin = sprite.rect.height
+        self.cells = cells
+        self.margin = margin // 2 + 1
+
+    def _buckets(self, left, top, right, bottom):
+        """ Возвращает списки объектов из ячеек, пересекающих прямоугольную область. """
+        cell_size = self.cell_size
+        x0, x1 = int(left // cell_size), int(right // cell_size)
+        y0, y1 = int(top // cell_size), int(bottom // cell_size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) >= len(self.cells):
+            # Область покрывает больше ячеек, чем заполнено - быстрее перебрать все
+            return list(self.cells.values())
+        buckets = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    buckets.append(bucket)
+        return buckets
+
+    def query(self, position, radius):
+        """
+        Кандидаты в радиусе от точки. Точное расстояние проверяет вызывающий код.
+        :param position: Центр области поиска
+        :param radius: Радиус поиска
+        :return: Живые объекты из ячеек, пересекающих квадрат вокруг круга поиска
+        """
+        buckets = self._buckets(position[0] - radius, position[1] - radius,
+                                position[0] + radius, position[1] + radius)
+        return [sprite for bucket in buckets for sprite in bucket if sprite.alive()]
+
+    def query_rect(self, rect):
+        """
+        Объекты, прямоугольники которых пересекаются с заданным.
+        :param rect: Прямоугольник (например, пули)
+        :return: Список живых пересекающихся объектов
+        """
+        margin = self.margin
+        buckets = self._buckets(rect.left - margin, rect.top - margin, rect.right + margin, rect.bottom + margin)
+        return [sprite for bucket in buckets for sprite in bucket
+                if sprite.alive() and sprite.rect.colliderect(rect)]
@@ -3,20 +3,30 @@
 
 import pygame
 from bullet import Bullet
+from entity import Entity
+from resources import load_image, rotate_image
 import math
 
 
-class Tower(pygame.sprite.Sprite):
+class Tower(Entity):
     """
     Базовый класс для всех башен, его методы включают инициализацию, отрисовку,
     обновление, стрельбу, поворот к цели и поиск цели.
     """
+    __slots__ = ('position', 'game', 'image', 'rect', 'original_image', 'tower_range', 'damage',
+                 'rate_of_fire', 'last_shot_time', 'level')
+    # Изображение башни после апгрейда
+    modified_image = None
+    # Изображение пули
+    bullet_sprite = 'assets/bullets/basic_bullet.png'
+
     def __init__(self, position, game):
         super().__init__()
         self.position = pygame.math.Vector2(position)
         self.game = game
 
         self.image = None
+        self.original_image = None
         self.rect = None
         # Радиус действия башни
         self.tower_range = 0
@@ -25,13 +35,9 @@ class Tower(pygame.sprite.Sprite):
         # Скорострельность в мс
         self.rate_of_fire = 0
         # Время последнего выстрела
-        self.last_shot_time = pygame.time.get_ticks()
+        self.last_shot_time = self.game.get_ticks()
         # Уровень башни
         self.level = 1
-        self.original_image = self.image
-        self.modified_image = self.image
-        # Изображение пули
-        self.bullet_sprite = 'assets/bullets/basic_bullet.png'
 
         # Проиграть звук при создании башни
         self.game.put_sound.play()
@@ -48,7 +54,8 @@ class Tower(pygame.sprite.Sprite):
         Отражение информации о башне на экране
         :param screen: Экран для отрисовки
         """
-        mouse_pos = pygame.mouse.get_pos()
+        camera = self.game.camera
+        mouse_pos = camera.to_world(pygame.mouse.get_pos())
         if self.is_hovered(mouse_pos):
             if self.level >=10:
                 title = 'ОРЕШНИК'
@@ -60,8 +67,8 @@ class Tower(pygame.sprite.Sprite):
             upgrade_cost_text = self.game.font.render(f"Upgrade: ${self.upgrade_cost()  }", True, (255, 255, 255))
 
             # Позиция текста
-            level_text_pos = (self.position.x, self.position.y + 20)
-            upgrade_cost_pos = (self.position.x, self.position.y + 40)
+            level_text_pos = camera.apply((self.position.x, self.position.y + 20))
+            upgrade_cost_pos = camera.apply((self.position.x, self.position.y + 40))
 
             # Вывод текста
             screen.blit(level_text, level_text_pos)
@@ -70,12 +77,15 @@ class Tower(pygame.sprite.Sprite):
     def update(self, enemies, current_time, bullets_group):
         """
         Обновляет состояние башни: поиск цели, стрельба и создание пуль.
-        :param enemies: Список врагов.
+        :param enemies: Пространственный индекс врагов (SpatialHash).
         :param current_time: Текущее время.
         :param bullets_group: Список пуль.
         """
         if current_time - self.last_shot_time > self.rate_of_fire:
-            target = self.find_target(enemies)
+            # Не стреляем по врагам, которых уже уничтожат летящие к ним пули
+            ledger = self.game.level.ledger
+            target = self.find_target([enemy for enemy in enemies.query(self.position, self.tower_range)
+                                       if not ledger.is_covered(enemy)])
             if target:
                 self.rotate_towards_target(target)
                 self.shoot(target, bullets_group)
@@ -105,7 +115,7 @@ class Tower(pygame.sprite.Sprite):
         # Преобразуем радианы в градусы
         angle_deg = math.degrees(angle_rad)
         angle_deg = -angle_deg - 90
-        self.image = pygame.transform.rotate(self.original_image, angle_deg)
+        self.image = rotate_image(self.original_image, angle_deg)
         self.rect = self.image.get_rect(center=self.position)
 
     def find_target(self, enemies):
@@ -126,8 +136,7 @@ class Tower(pygame.sprite.Sprite):
     def upgrade(self):
         """ Апгрейд башни """
         if self.game.settings.starting_money < self.upgrade_cost():
-            self.game.last_event_text = 'Not enough money for an upgrade!'
-            print(self.game.last_event_text)
+            self.game.log_event('Not enough money for an upgrade!')
             return
         # Уменьшить количество денег на стоимость апгрейда
         self.game.settings.starting_money -= self.upgrade_cost()
@@ -141,18 +150,19 @@ class Tower(pygame.sprite.Sprite):
         self.rate_of_fire = round(self.rate_of_fire * 0.8)
 
         # Изменить изображение башни
-        print(self.image)
-        self.image = pygame.image.load(self.modified_image).convert_alpha()
+        self.image = load_image(self.modified_image)
         self.original_image = self.image
 
 
 class BasicTower(Tower):
     """ Базовая башня """
+    __slots__ = ()
+    modified_image = 'assets/towers/basic_tower_modified.png'
+
     def __init__(self, position, game):
         super().__init__(position, game)
-        self.image = pygame.image.load('assets/towers/basic_tower.png').convert_alpha()
+        self.image = load_image('assets/towers/basic_tower.png')
         self.original_image = self.image
-        self.modified_image = 'assets/towers/basic_tower_modified.png'
         self.rect = self.image.get_rect(center=self.position)
         self.tower_range = 150
         self.damage = 20
@@ -164,23 +174,24 @@ class BasicTower(Tower):
         :param target: Цель
         :param bullets_group: Список пуль
         """
-        new_bullet = Bullet(self.position, target.position, self.damage, self.game, self.bullet_sprite)
+        new_bullet = Bullet(self.position, target.position, self.damage, self.game, self.bullet_sprite, target)
         bullets_group.add(new_bullet)
 
 
 class SniperTower(Tower):
     """ Снайперская башня """
+    __slots__ = ()
+    modified_image = 'assets/towers/sniper_tower_modified.png'
+    bullet_sprite = 'assets/bullets/sniper_bullet.png'
+
     def __init__(self, position, game):
         super().__init__(position, game)
-        self.image = pygame.image.load('assets/towers/sniper_tower.png').convert_alpha()
-        self.image = pygame.transform.rotate(self.image, 90)
+        self.image = rotate_image(load_image('assets/towers/sniper_tower.png'), 90)
         self.original_image = self.image
-        self.modified_image = 'assets/towers/sniper_tower_modified.png'
         self.rect = self.image.get_rect(center=self.position)
         self.tower_range = 300
         self.damage = 40
         self.rate_of_fire = 2000
-        self.bullet_sprite = 'assets/bullets/sniper_bullet.png'
 
     def find_target(self, enemies):
         """
@@ -202,19 +213,21 @@ class SniperTower(Tower):
         :param target: Цель
         :param bullets_group: Список пуль
         """
-        new_bullet = Bullet(self.position, target.position, self.damage, self.game, self.bullet_sprite)
+        new_bullet = Bullet(self.position, target.position, self.damage, self.game, self.bullet_sprite, target)
         bullets_group.add(new_bullet)
 
 
 class MoneyTower(Tower):
     """ Денежная башня """
+    __slots__ = ()
+    modified_image = 'assets/towers/money_tower.png'
+    bullet_sprite = 'assets/bullets/money_bullet.png'
+
     def __init__(self, position, game):
         super().__init__(position, game)
-        self.image = pygame.image.load('assets/towers/money_tower.png').convert_alpha()
+        self.image = load_image('assets/towers/money_tower.png')
         self.original_image = self.image
         self.rect = self.image.get_rect(center=self.position)
-        self.bullet_sprite = 'assets/bullets/money_bullet.png'
-        self.modified_image = 'assets/towers/money_tower.png'
 
         # Генерируемая сумма за 1 выстрел
         self.damage = 30
@@ -224,7 +237,7 @@ class MoneyTower(Tower):
     def update(self, enemies, current_time, bullets_group):
         """
         Обновляет состояние башни: проверка необходимости генерации денег.
-        :param enemies: Список врагов.
+        :param enemies: Пространственный индекс врагов (SpatialHash).
         :param current_time: Текущее время.
         :param bullets_group: Список пуль.
         """
@@ -235,6 +248,6 @@ class MoneyTower(Tower):
             self.game.money_sound.play()
             self.last_shot_time = current_time
             # Изменить картинку башни
-            self.image = pygame.image.load(self.bullet_sprite).convert_alpha()
+            self.image = load_image(self.bullet_sprite)
         elif current_time - self.last_shot_time > 250:
             self.image = self.original_image